@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 import argparse
+import sys
 from importlib.resources import files
-from .core import Config, FindReplace, generate_config_dict, set_config_values
+from typing import List, Optional
+from .core import BatchFindReplace, ChangeSetApplier, Config, FindReplace, generate_config_dict, set_config_values
+
+BATCH_OPTIONS = ('batch', 'dry_run', 'help')
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Advanced find and replace utility')
@@ -18,12 +22,44 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument('--pattern-list-file', help='Path to pattern list YAML/JSON file')
     parser.add_argument('--pattern-list-name', help='Name of pattern list to use')
     parser.add_argument('--ensure-new-line', action='store_true', help='End output files in a new line')
+    parser.add_argument('--section-cache-mb', type=float, help='Memory cap for the section cache in MB (0 disables it)')
+    parser.add_argument('--shard', help='Process only shard i of N (e.g., "2/4"), partitioned by path hash')
+    parser.add_argument('--work-queue', help='SQLite file shared by workers that pull file batches from a queue')
+    parser.add_argument('--queue-batch-size', type=int, help='Number of files claimed from the work queue at a time')
+    parser.add_argument('--changeset', help='Write a change set file that "frepl apply" can replay later')
+    parser.add_argument('--journal', help='Append-only journal recording each completed file')
+    parser.add_argument('--resume', action='store_true', help='Skip files the journal already records as completed')
+    parser.add_argument('--progress', action='store_true', help='Show live progress with files/sec, bytes and ETA')
     parser.add_argument('--config', help='Path to config YAML/JSON file')
+    parser.add_argument('--explain-plan', action='store_true', help='Show the pattern execution plan without processing files')
+    parser.add_argument('--batch', help='Path to batch manifest YAML/JSON file listing several configs')
+    return parser
+
+def build_apply_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='frepl apply', description='Apply a change set recorded by a dry run')
+    parser.add_argument('changeset', help='Path to change set file')
     return parser
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['apply']:
+        apply_args = build_apply_parser().parse_args(argv[1:])
+        ChangeSetApplier().apply(apply_args.changeset)
+        return
+
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        conflicting = [
+            action.option_strings[0]
+            for action in parser._actions
+            if action.dest not in BATCH_OPTIONS and getattr(args, action.dest) != action.default
+        ]
+        if conflicting:
+            parser.error(f"--batch cannot be combined with {', '.join(conflicting)}; set options in the manifest")
+        BatchFindReplace(args.batch, dry_run=args.dry_run).process_files()
+        return
 
     config_dict = generate_config_dict(args)
 
@@ -33,4 +69,8 @@ def main() -> None:
     config_dict = set_config_values(config_dict, args.config)
 
     config = Config(**config_dict)
-    FindReplace(config, args.config).process_files()
+    engine = FindReplace(config, args.config)
+    if args.explain_plan:
+        engine.explain_plan()
+        return
+    engine.process_files()
@@ -2,15 +2,22 @@ from colorama import init
 
 init()
 
-from .models import Config, MatchChange, Pattern, Section
+from .models import Config, FileResult, MatchChange, Pattern, PlanStep, RunSummary, Section
 from .runner import FindReplace
+from .batch_runner import BatchFindReplace
+from .changeset import ChangeSetApplier
 from .configuration import generate_config_dict, load_config_file, set_config_values
 
 __all__ = [
+    "BatchFindReplace",
+    "ChangeSetApplier",
     "Config",
+    "FileResult",
     "FindReplace",
     "MatchChange",
     "Pattern",
+    "PlanStep",
+    "RunSummary",
     "Section",
     "generate_config_dict",
     "load_config_file",
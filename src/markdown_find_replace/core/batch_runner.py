@@ -0,0 +1,153 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from colorama import Fore, Style
+
+from .configuration import load_config_file, set_config_values
+from .file_processor import FileProcessor
+from .file_resolver import FileResolver
+from .models import Config, FileResult, Pattern, RunSummary, Section
+from .pattern_applier import PatternApplier
+from .pattern_loader import PatternLoader
+from .section_cache import build_section_cache
+from .section_splitter import SectionSplitter
+
+UNSUPPORTED_ENTRY_KEYS = ('shard', 'work_queue', 'queue_batch_size', 'journal', 'resume', 'changeset', 'progress')
+
+
+@dataclass
+class BatchEntry:
+    name: str
+    config: Config
+    patterns: Sequence[Pattern]
+    processor: FileProcessor
+
+
+class BatchFindReplace:
+    def __init__(
+        self,
+        manifest_path: str,
+        dry_run: bool = False,
+        splitter: Optional[SectionSplitter] = None,
+        applier: Optional[PatternApplier] = None,
+    ):
+        self.manifest_path = manifest_path
+        self.dry_run = dry_run
+        self.resolver = FileResolver(manifest_path)
+        self.splitter = splitter or SectionSplitter()
+        self.applier = applier or PatternApplier()
+        self.summary = RunSummary()
+        manifest = self._load_manifest()
+        self.cache = build_section_cache(manifest.get('section_cache_mb'))
+        entries = [self._build_entry(index, raw) for index, raw in enumerate(manifest.get('configs') or [])]
+        self.entries: List[BatchEntry] = [entry for entry in entries if entry is not None]
+
+    def process_files(self) -> None:
+        work = self._collect_work()
+        if not work:
+            print(f"{Fore.YELLOW}No files found matching pattern{Style.RESET_ALL}")
+            return
+
+        for file_path, entries in work.values():
+            self._process_file(file_path, entries)
+
+        self.entries[0].processor.report_summary(self._summary_status())
+
+    def _summary_status(self) -> str:
+        dry_runs = {bool(entry.config.dry_run) for entry in self.entries}
+        if dry_runs == {True}:
+            return 'would change'
+        if dry_runs == {False}:
+            return 'changed'
+        return 'changed or would change'
+
+    def _load_manifest(self) -> Dict:
+        manifest = load_config_file(self.manifest_path) or {}
+        if isinstance(manifest, list):
+            return {'configs': manifest}
+        return manifest
+
+    def _build_entry(self, index: int, raw: Dict) -> Optional[BatchEntry]:
+        data = raw.copy()
+        name = data.pop('name', None) or f"config_{index + 1}"
+        config_file = data.pop('config', None)
+
+        config_file_path = self.manifest_path
+        if config_file:
+            config_file_path = self.resolver.resolve(config_file)
+            data = set_config_values(data, config_file_path)
+
+        unsupported = [key for key in UNSUPPORTED_ENTRY_KEYS if data.get(key)]
+        if unsupported:
+            print(
+                f"{Fore.RED}Error: {name} sets {', '.join(unsupported)}, "
+                f"which batch manifests do not support{Style.RESET_ALL}"
+            )
+            return None
+
+        if self.dry_run:
+            data['dry_run'] = True
+        if self.cache is None:
+            data['section_cache_mb'] = 0
+
+        config = Config(**data)
+        patterns = PatternLoader(config, FileResolver(config_file_path)).load()
+        processor = FileProcessor(config, self.splitter, self.applier, self.cache, self.summary)
+        return BatchEntry(name=name, config=config, patterns=patterns, processor=processor)
+
+    def _collect_work(self) -> Dict[Path, Tuple[Path, List[BatchEntry]]]:
+        work: Dict[Path, Tuple[Path, List[BatchEntry]]] = {}
+
+        for entry in self.entries:
+            if not entry.patterns:
+                print(f"{Fore.RED}No patterns to apply for {entry.name}{Style.RESET_ALL}")
+                continue
+            for file_path in entry.processor.get_files():
+                key = file_path.resolve()
+                if key not in work:
+                    work[key] = (file_path, [])
+                work[key][1].append(entry)
+
+        return work
+
+    def _process_file(self, file_path: Path, entries: Sequence[BatchEntry]) -> None:
+        content = entries[0].processor.read_file(file_path)
+        if content is None:
+            return
+
+        classifying_patterns = [pattern for entry in entries for pattern in entry.patterns]
+        current_content = content
+        sections: Optional[List[Section]] = None
+        split_frontmatter_in_body: Optional[bool] = None
+        writer: Optional[FileProcessor] = None
+        total_changes = 0
+        changed = False
+
+        for entry in entries:
+            processor = entry.processor
+            if sections is None or entry.config.frontmatter_in_body != split_frontmatter_in_body:
+                split_frontmatter_in_body = entry.config.frontmatter_in_body
+                sections = processor.split_sections(current_content, split_frontmatter_in_body, classifying_patterns)
+
+            section_texts, changes = processor.apply_patterns(sections, entry.patterns)
+            joined_content = ''.join(section_texts)
+            modified_content = processor.finalize_content(joined_content, current_content.endswith('\n'))
+
+            total_changes += len(changes)
+            if changes:
+                processor.report_changes(file_path, changes)
+
+            if modified_content == current_content:
+                continue
+            changed = True
+            if entry.config.dry_run:
+                continue
+
+            current_content = modified_content
+            writer = processor
+            sections = None
+
+        self.summary.record(FileResult(path=str(file_path), changed=changed, changes=total_changes))
+        if writer is not None and current_content != content:
+            writer.write_file(file_path, current_content)
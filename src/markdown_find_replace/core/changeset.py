@@ -0,0 +1,174 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from colorama import Fore, Style
+
+from .hashing import content_hash
+from .models import RunSummary, Section
+
+CHANGESET_VERSION = 1
+
+Span = Tuple[int, int, str]
+
+
+class ChangeSetWriter:
+    def __init__(self, changeset_path: str, pattern_set: str):
+        self.changeset_path = changeset_path
+        self.handle = open(changeset_path, 'w', encoding='utf-8')
+        self._write({'changeset': CHANGESET_VERSION, 'pattern_set': pattern_set})
+
+    def close(self) -> None:
+        self.handle.close()
+
+    def record(self, file_path: Path, base_hash: str, result_hash: str, spans: Sequence[Span]) -> None:
+        self._write(
+            {
+                'path': str(file_path),
+                'base_hash': base_hash,
+                'result_hash': result_hash,
+                'spans': [list(span) for span in spans],
+            }
+        )
+
+    def _write(self, entry: Dict) -> None:
+        self.handle.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.handle.flush()
+
+    def spans(
+        self, content: str, modified_content: str, sections: Sequence[Section], section_texts: Sequence[str]
+    ) -> List[Span]:
+        if not sections or sum(len(section.text) for section in sections) != len(content):
+            return [(0, len(content), modified_content)]
+
+        pieces = self._align_tail(list(section_texts), modified_content)
+        spans: List[Span] = []
+        offset = 0
+        for section, piece in zip(sections, pieces):
+            original = section.text
+            if piece != original:
+                prefix = _common_prefix_length(original, piece)
+                suffix = _common_suffix_length(original, piece, prefix)
+                spans.append((offset + prefix, offset + len(original) - suffix, piece[prefix:len(piece) - suffix]))
+            offset += len(original)
+        return spans
+
+    def _align_tail(self, pieces: List[str], modified_content: str) -> List[str]:
+        joined_content = ''.join(pieces)
+        if joined_content == modified_content:
+            return pieces
+
+        remaining = len(joined_content.rstrip('\n'))
+        core_length = remaining
+        for index, piece in enumerate(pieces):
+            if remaining >= len(piece):
+                remaining -= len(piece)
+                continue
+            pieces[index] = piece[:remaining]
+            remaining = 0
+        pieces[-1] += modified_content[core_length:]
+        return pieces
+
+
+class ChangeSetApplier:
+    def apply(self, changeset_path: str) -> RunSummary:
+        summary = RunSummary()
+        already_applied = 0
+        conflicts = 0
+
+        try:
+            handle = open(changeset_path, encoding='utf-8')
+        except OSError as error:
+            print(f"{Fore.RED}Error: cannot read change set {changeset_path}: {error}{Style.RESET_ALL}")
+            return summary
+
+        with handle:
+            try:
+                header = json.loads(handle.readline() or '{}')
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get('changeset') != CHANGESET_VERSION:
+                print(f"{Fore.RED}Error: {changeset_path} is not a version {CHANGESET_VERSION} change set{Style.RESET_ALL}")
+                return summary
+
+            for line_number, line in enumerate(handle, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    status = self._apply_entry(json.loads(line))
+                except (ValueError, KeyError, TypeError) as error:
+                    print(
+                        f"{Fore.RED}Error: malformed change set entry on line {line_number} "
+                        f"of {changeset_path}: {error}{Style.RESET_ALL}"
+                    )
+                    status = 'error'
+                summary.files_processed += 1
+                if status == 'applied':
+                    summary.files_changed += 1
+                elif status == 'already_applied':
+                    already_applied += 1
+                elif status == 'conflict':
+                    conflicts += 1
+
+        print(f"{Fore.CYAN}Applied {summary.files_changed} files from {changeset_path}{Style.RESET_ALL}")
+        if already_applied:
+            print(f"{Fore.YELLOW}{already_applied} files were already up to date{Style.RESET_ALL}")
+        if conflicts:
+            print(f"{Fore.RED}{conflicts} files changed since the dry run and were not applied{Style.RESET_ALL}")
+        return summary
+
+    def _apply_entry(self, entry: Dict) -> str:
+        file_path = Path(entry['path'])
+        try:
+            with open(file_path, 'rb') as handle:
+                content = handle.read().decode('utf-8')
+        except Exception as error:
+            print(f"{Fore.RED}Error processing {file_path}: {error}{Style.RESET_ALL}")
+            return 'error'
+
+        current_hash = content_hash(content)
+        if current_hash == entry['result_hash']:
+            return 'already_applied'
+        if current_hash != entry['base_hash']:
+            print(f"{Fore.RED}[CONFLICT] {file_path} changed since the dry run{Style.RESET_ALL}")
+            return 'conflict'
+
+        parts: List[str] = []
+        position = 0
+        for start, end, replacement in entry['spans']:
+            parts.append(content[position:start])
+            parts.append(replacement)
+            position = end
+        parts.append(content[position:])
+        modified_content = ''.join(parts)
+
+        if content_hash(modified_content) != entry['result_hash']:
+            print(f"{Fore.RED}Error: change set entry for {file_path} does not reproduce its result{Style.RESET_ALL}")
+            return 'error'
+
+        with open(file_path, 'w', encoding='utf-8', newline='') as handle:
+            handle.write(modified_content)
+        print(f"{Fore.GREEN}[APPLIED] {file_path}{Style.RESET_ALL}")
+        return 'applied'
+
+
+def _common_prefix_length(first: str, second: str) -> int:
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(first: str, second: str, prefix: int) -> int:
+    low, high = 0, min(len(first), len(second)) - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[len(first) - middle:] == second[len(second) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -23,6 +23,14 @@ def generate_config_dict(args: Optional[Any] = None) -> Dict:
         'pattern_list_file': args.pattern_list_file if args else None,
         'pattern_list_name': args.pattern_list_name if args else None,
         'ensure_new_line': args.ensure_new_line if args and args.ensure_new_line else None,
+        'section_cache_mb': args.section_cache_mb if args else None,
+        'shard': args.shard if args else None,
+        'work_queue': args.work_queue if args else None,
+        'queue_batch_size': args.queue_batch_size if args else None,
+        'journal': args.journal if args else None,
+        'resume': args.resume if args and args.resume else None,
+        'progress': args.progress if args and args.progress else None,
+        'changeset': args.changeset if args else None,
     }
 
 def set_config_values(config: Dict, config_path: str) -> Dict:
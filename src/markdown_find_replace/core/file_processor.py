@@ -1,33 +1,91 @@
+import hashlib
 from pathlib import Path
-from typing import List, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from colorama import Fore, Style
 
-from .models import Config, Pattern
+from .changeset import ChangeSetWriter
+from .hashing import content_hash, pattern_set_id
+from .models import Config, FileResult, Pattern, RunSummary, Section
+from .journal import RunJournal
 from .pattern_applier import PatternApplier
+from .progress import ProgressReporter
+from .section_cache import SectionCache, build_section_cache
 from .section_splitter import SectionSplitter
+from .work_queue import DEFAULT_QUEUE_BATCH_SIZE, WorkQueue, default_worker_id
 
 
 class FileProcessor:
-    def __init__(self, config: Config, splitter: SectionSplitter | None = None, applier: PatternApplier | None = None):
+    def __init__(
+        self,
+        config: Config,
+        splitter: SectionSplitter | None = None,
+        applier: PatternApplier | None = None,
+        cache: SectionCache | None = None,
+        summary: RunSummary | None = None,
+    ):
         self.config = config
         self.splitter = splitter or SectionSplitter()
         self.applier = applier or PatternApplier()
+        self.cache = cache if cache is not None else build_section_cache(config.section_cache_mb)
+        self.summary = summary or RunSummary()
+        self.journal: Optional[RunJournal] = None
+        self.progress: Optional[ProgressReporter] = None
+        self.changeset: Optional[ChangeSetWriter] = None
 
     def process_files(self, patterns: Sequence[Pattern]) -> None:
         if not patterns:
             print(f"{Fore.RED}No patterns to apply{Style.RESET_ALL}")
             return
 
-        files = self._get_files()
+        files = self.get_files()
+        if self.config.shard:
+            shard = self._parse_shard(self.config.shard)
+            if shard is None:
+                print(
+                    f"{Fore.RED}Error: shard must look like i/N with 1 <= i <= N, "
+                    f"got '{self.config.shard}'{Style.RESET_ALL}"
+                )
+                return
+            files = self._select_shard(files, *shard)
+
         if not files:
             print(f"{Fore.YELLOW}No files found matching pattern{Style.RESET_ALL}")
             return
 
-        for file_path in files:
-            self._process_file(file_path, patterns)
+        if self.config.resume and not self.config.journal:
+            print(f"{Fore.RED}Error: --resume requires a journal file{Style.RESET_ALL}")
+            return
+
+        if self.config.journal:
+            self.journal = RunJournal(
+                self.config.journal, pattern_set_id(patterns), self.config.dry_run, self.config.resume
+            )
+        if self.config.changeset:
+            self.changeset = ChangeSetWriter(self.config.changeset, pattern_set_id(patterns))
+        if self.config.progress:
+            self.progress = ProgressReporter(None if self.config.work_queue else len(files))
+
+        try:
+            if self.config.work_queue:
+                self._process_queue(files, patterns)
+                return
+
+            for file_path in files:
+                self._run_file(file_path, patterns)
 
-    def _get_files(self) -> List[Path]:
+            self._finish_progress()
+            self.report_summary()
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            if self.changeset is not None:
+                self.changeset.close()
+                self.changeset = None
+            self.progress = None
+
+    def get_files(self) -> List[Path]:
         path = Path(self.config.path or '.')
         if path.is_file():
             return [path]
@@ -37,32 +95,204 @@ class FileProcessor:
             return list(path.glob(f"**/{pattern}"))
         return list(path.glob(pattern))
 
-    def _process_file(self, file_path: Path, patterns: Sequence[Pattern]) -> None:
+    def _parse_shard(self, shard: str) -> Optional[Tuple[int, int]]:
+        index, _, count = shard.partition('/')
+        if not index.strip().isdigit() or not count.strip().isdigit():
+            return None
+        index_value, count_value = int(index), int(count)
+        if count_value < 1 or not 1 <= index_value <= count_value:
+            return None
+        return index_value, count_value
+
+    def _file_key(self, file_path: Path) -> str:
+        try:
+            return file_path.relative_to(Path(self.config.path or '.')).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    def _resolve_key(self, key: str) -> Path:
+        return Path(self.config.path or '.') / key
+
+    def _select_shard(self, files: Sequence[Path], index: int, count: int) -> List[Path]:
+        selected: List[Path] = []
+        for file_path in files:
+            digest = hashlib.sha1(self._file_key(file_path).encode('utf-8')).digest()
+            if int.from_bytes(digest[:8], 'big') % count == index - 1:
+                selected.append(file_path)
+        return selected
+
+    def _process_queue(self, files: Sequence[Path], patterns: Sequence[Pattern]) -> None:
+        queue = WorkQueue(self.config.work_queue)
+        worker = default_worker_id()
+        batch_size = self.config.queue_batch_size or DEFAULT_QUEUE_BATCH_SIZE
+
+        try:
+            queue.enqueue(self._file_key(file_path) for file_path in files)
+            while True:
+                batch = queue.claim(worker, batch_size)
+                if not batch:
+                    break
+                results: List[Tuple[str, Optional[FileResult]]] = []
+                for key in batch:
+                    results.append((key, self._run_file(self._resolve_key(key), patterns)))
+                queue.complete(worker, results)
+
+            self._finish_progress()
+            self.report_summary()
+            self._report_queue_summary(queue)
+        finally:
+            queue.close()
+
+    def _run_file(self, file_path: Path, patterns: Sequence[Pattern]) -> Optional[FileResult]:
+        result = self._process_file(file_path, patterns)
+        if result is not None:
+            self.summary.record(result)
+        if self.progress is not None:
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                size = 0
+            self.progress.advance(size)
+        return result
+
+    def _finish_progress(self) -> None:
+        if self.progress is not None:
+            self.progress.finish()
+
+    def _process_file(self, file_path: Path, patterns: Sequence[Pattern]) -> Optional[FileResult]:
+        content = self.read_file(file_path)
+        if content is None:
+            return None
+
+        base_hash = content_hash(content) if self.journal is not None else None
+        if base_hash is not None:
+            entry = self.journal.completed_entry(self._file_key(file_path), base_hash)
+            if entry is not None:
+                report = [tuple(change) for change in entry.get('report', [])]
+                if report:
+                    self.report_changes(file_path, report)
+                if self.changeset is not None and entry['base_hash'] != entry['result_hash']:
+                    self._record_journaled_changes(file_path, entry)
+                return FileResult(
+                    path=str(file_path),
+                    changed=entry['base_hash'] != entry['result_hash'],
+                    changes=entry['changes'],
+                    skipped=True,
+                )
+
+        sections = self.split_sections(content, self.config.frontmatter_in_body, patterns)
+        section_texts, all_changes = self.apply_patterns(sections, patterns)
+        modified_content = self.finalize_content(''.join(section_texts), content.endswith('\n'))
+
+        if all_changes:
+            self.report_changes(file_path, all_changes)
+
+        if not self.config.dry_run and modified_content != content:
+            self.write_file(file_path, modified_content)
+
+        spans = None
+        if self.changeset is not None and modified_content != content:
+            spans = self.changeset.spans(content, modified_content, sections, section_texts)
+            self.changeset.record(
+                file_path, base_hash or content_hash(content), content_hash(modified_content), spans
+            )
+
+        if base_hash is not None:
+            self.journal.record(
+                self._file_key(file_path), base_hash, content_hash(modified_content), all_changes, spans
+            )
+
+        return FileResult(path=str(file_path), changed=modified_content != content, changes=len(all_changes))
+
+    def _record_journaled_changes(self, file_path: Path, entry: Dict) -> None:
+        if 'spans' not in entry:
+            print(
+                f"{Fore.YELLOW}Warning: {file_path} was completed without a change set; "
+                f"run without --resume to record it{Style.RESET_ALL}"
+            )
+            return
+        self.changeset.record(file_path, entry['base_hash'], entry['result_hash'], entry['spans'])
+
+    def _classifications(self, patterns: Sequence[Pattern]) -> Tuple[bool, bool]:
+        detect_tables = any(pattern.skip_tables or not pattern.line_local for pattern in patterns)
+        detect_code_blocks = detect_tables or any(pattern.skip_code_blocks for pattern in patterns)
+        return detect_code_blocks, detect_tables
+
+    def split_sections(self, content: str, frontmatter_in_body: bool, patterns: Sequence[Pattern]) -> List[Section]:
+        detect_code_blocks, detect_tables = self._classifications(patterns)
+        return self.splitter.split(
+            content,
+            frontmatter_in_body,
+            detect_code_blocks=detect_code_blocks,
+            detect_tables=detect_tables,
+        )
+
+    def read_file(self, file_path: Path) -> Optional[str]:
         try:
             with open(file_path, 'rb') as handle:
                 content_bytes = handle.read()
-            ends_with_newline = content_bytes.endswith(b'\n')
-            content = content_bytes.decode('utf-8')
+            return content_bytes.decode('utf-8')
         except Exception as error:
             print(f"{Fore.RED}Error processing {file_path}: {error}{Style.RESET_ALL}")
-            return
+            return None
+
+    def write_file(self, file_path: Path, content: str) -> None:
+        with open(file_path, 'w', encoding='utf-8', newline='') as handle:
+            handle.write(content)
 
-        sections = self.splitter.split(content, self.config.frontmatter_in_body)
-        new_content_parts: List[str] = []
-        all_changes: List[tuple[int, str, str]] = []
+    def apply_patterns(
+        self, sections: Sequence[Section], patterns: Sequence[Pattern]
+    ) -> Tuple[List[str], List[Tuple[int, str, str]]]:
+        section_texts: List[str] = []
+        all_changes: List[Tuple[int, str, str]] = []
+        set_id = None
+        if self.cache is not None and self._classifications(patterns)[0]:
+            set_id = pattern_set_id(patterns)
 
         for section in sections:
-            section_text = section.text
-            for pattern in patterns:
-                if section.is_code_block and pattern.skip_code_blocks:
-                    continue
-                if section.is_table and pattern.skip_tables:
-                    continue
-                section_text, changes = self.applier.apply(section_text, pattern, section.start_line)
-                all_changes.extend(changes)
-            new_content_parts.append(section_text)
-
-        modified_content = ''.join(new_content_parts)
+            if set_id is None:
+                section_text, changes = self._apply_section(section, patterns)
+            else:
+                section_text, changes = self._apply_cached_section(section, patterns, set_id)
+            section_texts.append(section_text)
+            all_changes.extend(changes)
+
+        return section_texts, all_changes
+
+    def _apply_cached_section(
+        self, section: Section, patterns: Sequence[Pattern], set_id: str
+    ) -> Tuple[str, List[Tuple[int, str, str]]]:
+        key = self.cache.key(section, set_id)
+        cached = self.cache.get(key, section.text)
+        if cached is not None:
+            section_text, relative_changes = cached
+            return section_text, [(section.start_line + offset, old, new) for offset, old, new in relative_changes]
+
+        section_text, changes = self._apply_section(section, patterns)
+        relative_changes = [(line_num - section.start_line, old, new) for line_num, old, new in changes]
+        self.cache.put(key, section.text, section_text, relative_changes)
+        return section_text, changes
+
+    def _apply_section(self, section: Section, patterns: Sequence[Pattern]) -> Tuple[str, List[Tuple[int, str, str]]]:
+        section_text = section.text
+        section_changes: List[Tuple[int, str, str]] = []
+
+        for pattern in patterns:
+            if section.is_code_block and pattern.skip_code_blocks:
+                continue
+            if section.is_table and pattern.skip_tables:
+                continue
+            if not self._prerequisites_present(section_text, pattern):
+                continue
+            section_text, changes = self.applier.apply(section_text, pattern, section.start_line)
+            section_changes.extend(changes)
+
+        return section_text, section_changes
+
+    def _prerequisites_present(self, text: str, pattern: Pattern) -> bool:
+        return all(literal in text for literal in pattern.required_literals)
+
+    def finalize_content(self, modified_content: str, ends_with_newline: bool) -> str:
         if ends_with_newline and not modified_content.endswith('\n'):
             modified_content += '\n'
         elif not ends_with_newline and modified_content.endswith('\n'):
@@ -71,14 +301,9 @@ class FileProcessor:
         if self.config.ensure_new_line:
             modified_content = modified_content.rstrip('\n') + "\n"
 
-        if all_changes:
-            self._report_changes(file_path, all_changes)
-
-        if not self.config.dry_run and modified_content != content:
-            with open(file_path, 'w', encoding='utf-8', newline='') as handle:
-                handle.write(modified_content)
+        return modified_content
 
-    def _report_changes(self, file_path: Path, changes: List[tuple[int, str, str]]) -> None:
+    def report_changes(self, file_path: Path, changes: List[tuple[int, str, str]]) -> None:
         lines_changed = 0
         for line_num, old, new in sorted(changes, key=lambda item: item[0]):
             if not self.config.dry_run:
@@ -107,6 +332,33 @@ class FileProcessor:
 
             lines_changed += new.count('\n') - old.count('\n')
 
+    def report_summary(self, status: Optional[str] = None) -> None:
+        summary = self.summary
+        if status is None:
+            status = 'would change' if self.config.dry_run else 'changed'
+        print(
+            f"{Fore.CYAN}Processed {summary.files_processed} files, "
+            f"{summary.files_changed} {status} ({summary.changes} changes){Style.RESET_ALL}"
+        )
+        if summary.files_skipped:
+            print(f"{Fore.CYAN}Resumed: {summary.files_skipped} files already completed in journal{Style.RESET_ALL}")
+        if self.cache is not None and (self.cache.hits or self.cache.misses):
+            print(
+                f"{Fore.CYAN}Section cache: {self.cache.hits} hits, {self.cache.misses} misses, "
+                f"{len(self.cache)} entries{Style.RESET_ALL}"
+            )
+
+    def _report_queue_summary(self, queue: WorkQueue) -> None:
+        merged = queue.summary()
+        status = 'would change' if self.config.dry_run else 'changed'
+        pending = queue.pending()
+        print(
+            f"{Fore.CYAN}Queue {self.config.work_queue}: {merged.files_processed} files by {queue.workers()} worker(s), "
+            f"{merged.files_changed} {status} ({merged.changes} changes){Style.RESET_ALL}"
+        )
+        if pending:
+            print(f"{Fore.YELLOW}{pending} files still claimed by other workers{Style.RESET_ALL}")
+
     def _count_substring_at_end(self, value: str, substring: str) -> int:
         count = 0
         working = value
@@ -0,0 +1,16 @@
+import hashlib
+from typing import Sequence
+
+from .models import Pattern
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def pattern_set_id(patterns: Sequence[Pattern]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for pattern in patterns:
+        fields = (pattern.find, pattern.replace, pattern.is_regex, pattern.skip_code_blocks, pattern.skip_tables)
+        digest.update(repr(fields).encode('utf-8'))
+    return digest.hexdigest()
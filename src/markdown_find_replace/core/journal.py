@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from colorama import Fore, Style
+
+
+class RunJournal:
+    def __init__(self, journal_path: str, pattern_set: str, dry_run: bool, resume: bool = False):
+        self.journal_path = journal_path
+        self.pattern_set = pattern_set
+        self.dry_run = bool(dry_run)
+        self.entries: Dict[str, Dict] = self._load() if resume else {}
+        self.handle = open(journal_path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        self.handle.close()
+
+    def completed_entry(self, file_key: str, current_hash: str) -> Optional[Dict]:
+        entry = self.entries.get(file_key)
+        if entry is None:
+            return None
+        if entry.get('pattern_set') != self.pattern_set or entry.get('dry_run') != self.dry_run:
+            return None
+
+        expected_hash = entry.get('base_hash') if self.dry_run else entry.get('result_hash')
+        if expected_hash != current_hash:
+            return None
+        return entry
+
+    def record(
+        self,
+        file_key: str,
+        base_hash: str,
+        result_hash: str,
+        changes: List[Tuple[int, str, str]],
+        spans: Optional[Sequence[Tuple[int, int, str]]] = None,
+    ) -> None:
+        entry = {
+            'path': file_key,
+            'pattern_set': self.pattern_set,
+            'dry_run': self.dry_run,
+            'base_hash': base_hash,
+            'result_hash': result_hash,
+            'changes': len(changes),
+        }
+        if self.dry_run:
+            entry['report'] = [list(change) for change in changes]
+        if spans is not None:
+            entry['spans'] = [list(span) for span in spans]
+        self.handle.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.handle.flush()
+
+    def _load(self) -> Dict[str, Dict]:
+        entries: Dict[str, Dict] = {}
+        path = Path(self.journal_path)
+        if not path.exists():
+            return entries
+
+        with open(path, encoding='utf-8') as handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(
+                        f"{Fore.YELLOW}Warning: ignoring unreadable journal line {line_number} "
+                        f"in {self.journal_path}{Style.RESET_ALL}"
+                    )
+                    continue
+                entries[entry['path']] = entry
+        return entries
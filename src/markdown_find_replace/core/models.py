@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -10,6 +10,8 @@ class Pattern:
     is_regex: bool = True
     skip_code_blocks: bool = False
     skip_tables: bool = False
+    required_literals: Tuple[str, ...] = ()
+    line_local: bool = False
 
 
 @dataclass
@@ -36,6 +38,14 @@ class Config:
     pattern_list_file: Optional[str] = None
     pattern_list_name: Optional[str] = None
     ensure_new_line: bool = False
+    section_cache_mb: Optional[float] = None
+    shard: Optional[str] = None
+    work_queue: Optional[str] = None
+    queue_batch_size: Optional[int] = None
+    journal: Optional[str] = None
+    resume: bool = False
+    progress: bool = False
+    changeset: Optional[str] = None
 
 
 @dataclass
@@ -44,3 +54,34 @@ class Section:
     text: str
     is_code_block: bool
     is_table: bool
+
+
+@dataclass
+class PlanStep:
+    index: int
+    pattern: Pattern
+    producers: List[int]
+
+
+@dataclass
+class FileResult:
+    path: str
+    changed: bool
+    changes: int
+    skipped: bool = False
+
+
+@dataclass
+class RunSummary:
+    files_processed: int = 0
+    files_changed: int = 0
+    changes: int = 0
+    files_skipped: int = 0
+
+    def record(self, result: FileResult) -> None:
+        self.files_processed += 1
+        self.changes += result.changes
+        if result.changed:
+            self.files_changed += 1
+        if result.skipped:
+            self.files_skipped += 1
@@ -1,11 +1,35 @@
 import json
-from typing import Dict, List
+import re
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 from colorama import Fore, Style
 
 from .file_resolver import FileResolver
-from .models import Config, Pattern
+from .models import Config, Pattern, PlanStep
+
+try:
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+GROUP_REFERENCE_RE = re.compile(r'\$\d+|\\\d+|\\g<[^>]*>')
+ESCAPE_RE = re.compile(r'\\.')
+ESCAPED_CHARACTERS = {'\\n': '\n', '\\t': '\t', '\\r': '\r', '\\\\': '\\'}
+LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+CATEGORY_ESCAPES = {
+    'CATEGORY_DIGIT': r'\d',
+    'CATEGORY_NOT_DIGIT': r'\D',
+    'CATEGORY_SPACE': r'\s',
+    'CATEGORY_NOT_SPACE': r'\S',
+    'CATEGORY_WORD': r'\w',
+    'CATEGORY_NOT_WORD': r'\W',
+}
+ZERO_WIDTH_OPCODES = (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+REPEAT_OPCODES = tuple(
+    getattr(sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT') if hasattr(sre_parse, name)
+)
 
 
 class PatternLoader:
@@ -26,7 +50,196 @@ class PatternLoader:
             )
 
         patterns.extend(self._load_from_files())
-        return patterns
+        return [self._analyze(pattern) for pattern in patterns]
+
+    def build_plan(self, patterns: List[Pattern]) -> List[PlanStep]:
+        plan: List[PlanStep] = []
+        templates: List[Optional[List[str]]] = []
+
+        for index, pattern in enumerate(patterns):
+            producers = [
+                earlier
+                for earlier, segments in enumerate(templates)
+                if pattern.required_literals
+                and (
+                    segments is None
+                    or any(
+                        self._can_produce(literal, segment)
+                        for literal in pattern.required_literals
+                        for segment in segments
+                    )
+                )
+            ]
+            plan.append(PlanStep(index=index, pattern=pattern, producers=producers))
+            templates.append(None if self._may_join_text(pattern) else self._replacement_segments(pattern))
+
+        return plan
+
+    def _analyze(self, pattern: Pattern) -> Pattern:
+        return replace(
+            pattern,
+            required_literals=pattern.required_literals or self._required_literals(pattern),
+            line_local=pattern.line_local or self._is_line_local(pattern),
+        )
+
+    def _is_line_local(self, pattern: Pattern) -> bool:
+        if not pattern.is_regex:
+            return True
+
+        try:
+            parsed = sre_parse.parse(pattern.find, re.MULTILINE)
+        except re.error:
+            return False
+        if parsed.getwidth()[0] == 0:
+            return False
+        return self._stays_on_line(parsed)
+
+    def _stays_on_line(self, items) -> bool:
+        for opcode, argument in items:
+            if opcode is sre_parse.LITERAL:
+                local = chr(argument) not in LINE_BREAKS
+            elif opcode is sre_parse.IN:
+                local = not any(self._set_matches(argument, character) for character in LINE_BREAKS)
+            elif opcode is sre_parse.AT:
+                local = argument in (sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY)
+            elif opcode is sre_parse.GROUPREF:
+                local = True
+            elif opcode is sre_parse.SUBPATTERN:
+                local = self._stays_on_line(argument[3])
+            elif opcode in REPEAT_OPCODES:
+                local = self._stays_on_line(argument[2])
+            elif opcode is sre_parse.BRANCH:
+                local = all(self._stays_on_line(branch) for branch in argument[1])
+            elif opcode is getattr(sre_parse, 'ATOMIC_GROUP', None):
+                local = self._stays_on_line(argument)
+            else:
+                local = False
+
+            if not local:
+                return False
+        return True
+
+    def _set_matches(self, items, character: str) -> bool:
+        negated = False
+        matches = False
+        for opcode, argument in items:
+            if opcode is sre_parse.NEGATE:
+                negated = True
+            elif opcode is sre_parse.LITERAL:
+                matches = matches or chr(argument) == character
+            elif opcode is sre_parse.RANGE:
+                matches = matches or argument[0] <= ord(character) <= argument[1]
+            elif opcode is sre_parse.CATEGORY and str(argument) in CATEGORY_ESCAPES:
+                matches = matches or re.match(CATEGORY_ESCAPES[str(argument)], character) is not None
+            else:
+                return True
+        return matches != negated
+
+    def _required_literals(self, pattern: Pattern) -> Tuple[str, ...]:
+        if not pattern.is_regex:
+            return (pattern.find,) if pattern.find else ()
+
+        try:
+            parsed = sre_parse.parse(pattern.find, re.MULTILINE)
+        except re.error:
+            return ()
+        if parsed.state.flags & re.IGNORECASE:
+            return ()
+
+        literals: List[str] = []
+        for literal in self._collect_literals(parsed):
+            if literal not in literals:
+                literals.append(literal)
+        return tuple(literals)
+
+    def _collect_literals(self, items) -> List[str]:
+        literals: List[str] = []
+        run: List[str] = []
+
+        for opcode, argument in items:
+            if opcode is sre_parse.LITERAL:
+                run.append(chr(argument))
+                continue
+
+            if run:
+                literals.append(''.join(run))
+                run = []
+
+            if opcode is sre_parse.SUBPATTERN:
+                _, add_flags, _, body = argument
+                if not add_flags & re.IGNORECASE:
+                    literals.extend(self._collect_literals(body))
+            elif opcode in REPEAT_OPCODES:
+                minimum, _, body = argument
+                if minimum >= 1:
+                    literals.extend(self._collect_literals(body))
+            elif opcode is sre_parse.ASSERT:
+                _, body = argument
+                literals.extend(self._collect_literals(body))
+
+        if run:
+            literals.append(''.join(run))
+        return literals
+
+    def _replacement_segments(self, pattern: Pattern) -> List[str]:
+        if not pattern.is_regex:
+            return [pattern.replace]
+        return [ESCAPE_RE.sub(self._unescape, piece) for piece in GROUP_REFERENCE_RE.split(pattern.replace) if piece]
+
+    def _unescape(self, match: re.Match) -> str:
+        return ESCAPED_CHARACTERS.get(match.group(0), match.group(0))
+
+    def _can_produce(self, literal: str, segment: str) -> bool:
+        for offset in range(1 - len(literal), len(segment)):
+            start, end = max(offset, 0), min(offset + len(literal), len(segment))
+            if segment[start:end] == literal[start - offset:end - offset]:
+                return True
+        return False
+
+    def _may_join_text(self, pattern: Pattern) -> bool:
+        if not pattern.is_regex:
+            return not pattern.replace
+
+        try:
+            parsed = sre_parse.parse(pattern.find, re.MULTILINE)
+        except re.error:
+            return True
+
+        items = list(parsed)
+        groups = self._group_positions(items)
+        spans = [(-1, -1)]
+        for reference in GROUP_REFERENCE_RE.findall(pattern.replace):
+            spans.append(self._reference_span(reference, parsed, groups, len(items)))
+        spans.append((len(items), len(items)))
+
+        pieces = GROUP_REFERENCE_RE.split(pattern.replace)
+        for index, piece in enumerate(pieces):
+            if not piece and not self._adjacent(items, spans[index], spans[index + 1]):
+                return True
+        return False
+
+    def _group_positions(self, items) -> Dict[int, int]:
+        positions: Dict[int, int] = {}
+        for index, (opcode, argument) in enumerate(items):
+            if opcode in REPEAT_OPCODES and argument[1] == 1 and len(argument[2]) == 1:
+                opcode, argument = argument[2][0]
+            if opcode is sre_parse.SUBPATTERN and argument[0] is not None:
+                positions[argument[0]] = index
+        return positions
+
+    def _reference_span(self, reference: str, parsed, groups: Dict[int, int], length: int) -> Optional[Tuple[int, int]]:
+        name = reference[3:-1] if reference.startswith('\\g<') else reference[1:]
+        group = int(name) if name.isdigit() else parsed.state.groupdict.get(name)
+        if group == 0:
+            return 0, length - 1
+        if group not in groups:
+            return None
+        return groups[group], groups[group]
+
+    def _adjacent(self, items, left: Optional[Tuple[int, int]], right: Optional[Tuple[int, int]]) -> bool:
+        if left is None or right is None or left[1] >= right[0]:
+            return False
+        return all(opcode in ZERO_WIDTH_OPCODES for opcode, _ in items[left[1] + 1:right[0]])
 
     def _load_from_files(self) -> List[Pattern]:
         patterns: List[Pattern] = []
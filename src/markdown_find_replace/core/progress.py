@@ -0,0 +1,51 @@
+import sys
+import time
+from typing import Optional, TextIO
+
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+class ProgressReporter:
+    def __init__(self, total: Optional[int] = None, stream: Optional[TextIO] = None):
+        self.total = total
+        self.stream = stream or sys.stderr
+        self.files = 0
+        self.bytes = 0
+        self.started_at = time.monotonic()
+        self._last_render = 0.0
+
+    def advance(self, size: int) -> None:
+        self.files += 1
+        self.bytes += size
+        now = time.monotonic()
+        if now - self._last_render >= PROGRESS_INTERVAL_SECONDS:
+            self._last_render = now
+            self._render(now)
+
+    def finish(self) -> None:
+        self._render(time.monotonic())
+        self.stream.write('\n')
+        self.stream.flush()
+
+    def _render(self, now: float) -> None:
+        elapsed = max(now - self.started_at, 1e-9)
+        files_per_second = self.files / elapsed
+        megabytes = self.bytes / (1024 * 1024)
+
+        counter = f"{self.files}/{self.total}" if self.total else f"{self.files}"
+        line = f"[{counter}] {files_per_second:.1f} files/s, {megabytes:.1f} MB ({megabytes / elapsed:.2f} MB/s)"
+        if self.total and files_per_second > 0:
+            remaining = max(self.total - self.files, 0) / files_per_second
+            line += f", ETA {self._format_duration(remaining)}"
+
+        self.stream.write(f"\r{line}")
+        self.stream.flush()
+
+    def _format_duration(self, seconds: float) -> str:
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours}h{minutes:02d}m"
+        if minutes:
+            return f"{minutes}m{seconds:02d}s"
+        return f"{seconds}s"
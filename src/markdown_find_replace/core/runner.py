@@ -1,8 +1,10 @@
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
+
+from colorama import Fore, Style
 
 from .file_processor import FileProcessor
 from .file_resolver import FileResolver
-from .models import Config, Pattern
+from .models import Config, Pattern, PlanStep
 from .pattern_applier import PatternApplier
 from .pattern_loader import PatternLoader
 from .section_splitter import SectionSplitter
@@ -27,5 +29,28 @@ class FindReplace:
     def process_files(self) -> None:
         self.file_processor.process_files(self.patterns)
 
+    def build_plan(self) -> List[PlanStep]:
+        return self.pattern_loader.build_plan(list(self.patterns))
+
+    def explain_plan(self) -> None:
+        plan = self.build_plan()
+        if not plan:
+            print(f"{Fore.RED}No patterns to apply{Style.RESET_ALL}")
+            return
+
+        for step in plan:
+            pattern = step.pattern
+            print(f"{Fore.GREEN}{step.index + 1}. {pattern.name}{Style.RESET_ALL}")
+            if pattern.required_literals:
+                literals = ', '.join(repr(literal) for literal in pattern.required_literals)
+                print(f"   requires: {literals}")
+            else:
+                print("   requires: nothing (always runs)")
+            if step.producers:
+                producers = ', '.join(f"{index + 1}. {plan[index].pattern.name}" for index in step.producers)
+                print(f"   {Fore.YELLOW}may be enabled by: {producers}{Style.RESET_ALL}")
+            elif pattern.required_literals:
+                print("   skipped for any section that does not already contain its literals")
+
     def resolve_path(self, file_path: str) -> str:
         return self.resolver.resolve(file_path)
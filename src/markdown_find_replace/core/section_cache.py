@@ -0,0 +1,73 @@
+import sys
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .hashing import content_hash
+from .models import Section
+
+DEFAULT_SECTION_CACHE_MB = 64
+ENTRY_OVERHEAD_BYTES = 256
+
+CacheKey = Tuple[str, str, str]
+Changes = List[Tuple[int, str, str]]
+
+
+def build_section_cache(cache_mb: Optional[float]) -> Optional["SectionCache"]:
+    if cache_mb is None:
+        cache_mb = DEFAULT_SECTION_CACHE_MB
+    if cache_mb <= 0:
+        return None
+    return SectionCache(int(cache_mb * 1024 * 1024))
+
+
+class SectionCache:
+    def __init__(self, max_bytes: int = DEFAULT_SECTION_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[Optional[str], Changes, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, section: Section, pattern_set_id: str) -> CacheKey:
+        return content_hash(section.text), self._section_kind(section), pattern_set_id
+
+    def get(self, key: CacheKey, original_text: str) -> Optional[Tuple[str, Changes]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        rewritten_text, relative_changes, _ = entry
+        return (original_text if rewritten_text is None else rewritten_text), relative_changes
+
+    def put(self, key: CacheKey, original_text: str, rewritten_text: str, relative_changes: Changes) -> None:
+        stored_text = None if rewritten_text == original_text else rewritten_text
+        size = ENTRY_OVERHEAD_BYTES + self._changes_size(relative_changes)
+        if stored_text is not None:
+            size += sys.getsizeof(stored_text)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (stored_text, relative_changes, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def _section_kind(self, section: Section) -> str:
+        if section.is_code_block:
+            return 'code'
+        if section.is_table:
+            return 'table'
+        return 'text'
+
+    def _changes_size(self, changes: Changes) -> int:
+        return sum(sys.getsizeof(original) + sys.getsizeof(replacement) for _, original, replacement in changes)
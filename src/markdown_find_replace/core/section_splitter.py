@@ -7,7 +7,13 @@ TABLE_SEPARATOR_RE = re.compile(r'^\|?(\s*:?-{3,}:?\s*\|)+\s*:?-{3,}:?\s*\|?$')
 
 
 class SectionSplitter:
-    def split(self, content: str, frontmatter_in_body: bool) -> List[Section]:
+    def split(
+        self,
+        content: str,
+        frontmatter_in_body: bool,
+        detect_code_blocks: bool = True,
+        detect_tables: bool = True,
+    ) -> List[Section]:
         sections: List[Section] = []
         working_content = content
         line_number = 1
@@ -27,6 +33,10 @@ class SectionSplitter:
         if not working_content:
             return sections
 
+        if not detect_code_blocks:
+            sections.append(Section(start_line=line_number, text=working_content, is_code_block=False, is_table=False))
+            return sections
+
         collected_lines: List[str] = []
         in_code_block = False
         in_yaml_block = False
@@ -72,6 +82,8 @@ class SectionSplitter:
                 )
             )
 
+        if not detect_tables:
+            return sections
         return self._mark_table_sections(sections)
 
     def _split_frontmatter(self, content: str) -> tuple[str, str, str]:
@@ -0,0 +1,95 @@
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .models import FileResult, RunSummary
+
+DEFAULT_QUEUE_BATCH_SIZE = 50
+QUEUE_LEASE_SECONDS = 15 * 60
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    def __init__(self, queue_path: str, lease_seconds: int = QUEUE_LEASE_SECONDS):
+        self.queue_path = queue_path
+        self.lease_seconds = lease_seconds
+        self.connection = sqlite3.connect(queue_path, timeout=60, isolation_level=None)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " worker TEXT,"
+            " claimed_at REAL,"
+            " changed INTEGER NOT NULL DEFAULT 0,"
+            " changes INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def enqueue(self, paths: Iterable[str]) -> None:
+        with self._transaction():
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO files (path) VALUES (?)", ((path,) for path in paths)
+            )
+
+    def claim(self, worker: str, batch_size: int) -> List[str]:
+        now = time.time()
+        with self._transaction():
+            rows = self.connection.execute(
+                "SELECT path FROM files"
+                " WHERE status = 'pending' OR (status = 'claimed' AND claimed_at < ?)"
+                " ORDER BY path LIMIT ?",
+                (now - self.lease_seconds, batch_size),
+            ).fetchall()
+            paths = [row[0] for row in rows]
+            self.connection.executemany(
+                "UPDATE files SET status = 'claimed', worker = ?, claimed_at = ? WHERE path = ?",
+                ((worker, now, path) for path in paths),
+            )
+        return paths
+
+    def complete(self, worker: str, results: Iterable[Tuple[str, Optional[FileResult]]]) -> None:
+        with self._transaction():
+            self.connection.executemany(
+                "UPDATE files SET status = ?, changed = ?, changes = ?"
+                " WHERE path = ? AND worker = ? AND status = 'claimed'",
+                (
+                    ('failed', 0, 0, path, worker)
+                    if result is None
+                    else ('done', int(result.changed), result.changes, path, worker)
+                    for path, result in results
+                ),
+            )
+
+    def pending(self) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM files WHERE status IN ('pending', 'claimed')"
+        ).fetchone()[0]
+
+    def workers(self) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(DISTINCT worker) FROM files WHERE worker IS NOT NULL"
+        ).fetchone()[0]
+
+    def summary(self) -> RunSummary:
+        files_processed, files_changed, changes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(changed), 0), COALESCE(SUM(changes), 0) FROM files WHERE status = 'done'"
+        ).fetchone()
+        return RunSummary(files_processed=files_processed, files_changed=files_changed, changes=changes)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
@@ -1,16 +1,22 @@
 import sys
 import textwrap
+import time
 from pathlib import Path
 
 import pytest
+import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.markdown_find_replace.core import Config, FindReplace, Pattern, set_config_values
+from src.markdown_find_replace.core import BatchFindReplace, ChangeSetApplier, Config, FileResult, FindReplace, Pattern, Section, set_config_values
+from src.markdown_find_replace.cli import main
+from src.markdown_find_replace.core.file_processor import FileProcessor
 from src.markdown_find_replace.core.pattern_applier import PatternApplier
+from src.markdown_find_replace.core.section_cache import SectionCache
 from src.markdown_find_replace.core.section_splitter import SectionSplitter
+from src.markdown_find_replace.core.work_queue import WorkQueue
 
 
 def test_split_content_sections_identifies_frontmatter_code_and_tables():
@@ -38,6 +44,22 @@ def test_split_content_sections_identifies_frontmatter_code_and_tables():
     assert any(section.is_table and "| h1 |" in section.text for section in sections)
 
 
+def test_split_classifies_only_what_patterns_need():
+    splitter = SectionSplitter()
+    text = "---\ntitle: Sample\n---\nText\n```\ncode\n```\n| h1 | h2 |\n"
+
+    bypassed = splitter.split(text, False, detect_code_blocks=False, detect_tables=False)
+    assert [(section.is_code_block, section.text) for section in bypassed] == [
+        (True, "---\ntitle: Sample\n---\n"),
+        (False, "Text\n```\ncode\n```\n| h1 | h2 |\n"),
+    ]
+    assert bypassed[1].start_line == 4
+
+    code_only = splitter.split(text, False, detect_tables=False)
+    assert any(section.is_code_block and "code" in section.text for section in code_only)
+    assert not any(section.is_table for section in code_only)
+
+
 def test_apply_plain_text_pattern_reports_changes():
     pattern = Pattern(
         name="plain",
@@ -160,3 +182,482 @@ def test_set_config_values_overrides_file_config(tmp_path):
     assert merged["dry_run"] is True
     assert merged["recursive"] is False
     assert merged["is_regex"] is False
+
+
+def test_batch_manifest_splits_each_file_once_until_an_entry_rewrites_it(tmp_path):
+    docs = tmp_path / "docs"
+    guides = docs / "guides"
+    guides.mkdir(parents=True)
+    (docs / "index.md").write_text("foo baz\n", encoding="utf-8")
+    (guides / "intro.md").write_text("foo baz\n", encoding="utf-8")
+
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text(
+        textwrap.dedent(
+            f"""
+            configs:
+              - path: "{docs}"
+                pattern: "*.md"
+                find: "foo"
+                replace: "bar"
+                is_regex: false
+              - path: "{guides}"
+                pattern: "*.md"
+                find: "baz"
+                replace: "qux"
+                is_regex: false
+            """
+        ),
+        encoding="utf-8",
+    )
+
+    class CountingSplitter(SectionSplitter):
+        calls = 0
+
+        def split(self, content, frontmatter_in_body, **classifications):
+            CountingSplitter.calls += 1
+            return super().split(content, frontmatter_in_body, **classifications)
+
+    BatchFindReplace(str(manifest), splitter=CountingSplitter()).process_files()
+
+    assert (docs / "index.md").read_text(encoding="utf-8") == "bar baz\n"
+    assert (guides / "intro.md").read_text(encoding="utf-8") == "bar qux\n"
+    assert CountingSplitter.calls == 3
+
+
+def test_batch_manifest_matches_running_configs_one_after_another(tmp_path):
+    patterns_file = tmp_path / "patterns.yaml"
+    patterns_file.write_text(
+        textwrap.dedent(
+            """
+            fence_tildes:
+              name: "fence_tildes"
+              find: "~~~"
+              replace: "```"
+              is_regex: false
+            rename_foo:
+              name: "rename_foo"
+              find: "foo"
+              replace: "bar"
+              is_regex: false
+              skip_code_blocks: true
+            """
+        ),
+        encoding="utf-8",
+    )
+    content = "x\n~~~\nfoo\n~~~\nfoo\n"
+    batch_target = tmp_path / "batch.md"
+    sequential_target = tmp_path / "sequential.md"
+    batch_target.write_text(content, encoding="utf-8")
+    sequential_target.write_text(content, encoding="utf-8")
+
+    entries = [
+        {"patterns_file": str(patterns_file), "pattern_name": "fence_tildes"},
+        {"patterns_file": str(patterns_file), "pattern_name": "rename_foo"},
+    ]
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text(
+        yaml.safe_dump({"configs": [dict(entry, path=str(batch_target)) for entry in entries]}),
+        encoding="utf-8",
+    )
+
+    BatchFindReplace(str(manifest)).process_files()
+    for entry in entries:
+        FindReplace(Config(path=str(sequential_target), **entry)).process_files()
+
+    expected = sequential_target.read_text(encoding="utf-8")
+    assert expected == "x\n```\nfoo\n```\nbar\n"
+    assert batch_target.read_text(encoding="utf-8") == expected
+
+
+def test_batch_manifest_rejects_entries_with_run_level_options(tmp_path, capsys):
+    target = tmp_path / "doc.md"
+    target.write_text("foo baz\n", encoding="utf-8")
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text(
+        yaml.safe_dump(
+            {
+                "configs": [
+                    {"name": "journaled", "path": str(target), "find": "foo", "replace": "bar", "is_regex": False, "journal": "run.jsonl"},
+                    {"path": str(target), "find": "baz", "replace": "qux", "is_regex": False},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    batch = BatchFindReplace(str(manifest))
+    batch.process_files()
+
+    assert "journaled sets journal" in capsys.readouterr().out
+    assert len(batch.entries) == 1
+    assert target.read_text(encoding="utf-8") == "foo qux\n"
+
+
+def test_batch_summary_status_covers_every_entry(tmp_path, capsys):
+    target = tmp_path / "doc.md"
+    target.write_text("foo baz\n", encoding="utf-8")
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text(
+        yaml.safe_dump(
+            {
+                "configs": [
+                    {"path": str(target), "find": "foo", "replace": "bar", "is_regex": False},
+                    {"path": str(target), "find": "baz", "replace": "qux", "is_regex": False, "dry_run": True},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    BatchFindReplace(str(manifest)).process_files()
+    assert "1 changed or would change (2 changes)" in capsys.readouterr().out
+
+    BatchFindReplace(str(manifest), dry_run=True).process_files()
+    assert "1 would change (1 changes)" in capsys.readouterr().out
+
+
+def test_batch_command_line_rejects_other_options(tmp_path, capsys):
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text("configs: []\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        main(["--batch", str(manifest), "--journal", "run.jsonl", "--shard", "1/2"])
+
+    assert "--batch cannot be combined with --shard, --journal" in capsys.readouterr().err
+    main(["--batch", str(manifest), "--dry-run"])
+
+
+def test_pattern_plan_skips_patterns_without_required_literals(tmp_path):
+    config = Config(
+        patterns_file="config/fr_patterns.yaml",
+        pattern_list_file="config/fr_list.yaml",
+        pattern_list_name="remove_bold_italics",
+    )
+    engine = FindReplace(config)
+    plan = engine.build_plan()
+
+    restore_bold = next(step for step in plan if step.pattern.name == "restore_protected_bold")
+    assert restore_bold.pattern.required_literals == ("@@PROTECTED_BOLD_START@@", "@@PROTECTED_BOLD_END@@")
+    assert [plan[index].pattern.name for index in restore_bold.producers] == [
+        "protect_first_level_bold_list",
+        "protect_first_level_bold_list",
+        "protect_subsequent_level_italicized_list",
+        "protect_leading_asterisk",
+        "remove_remaining_bold",
+        "remove_remaining_italicized",
+    ]
+    assert plan[2].producers == []
+    assert plan[5].producers == [4]
+
+    edge_lists = tmp_path / "lists.yaml"
+    edge_lists.write_text("tabs_then_dashes:\n  - tabs_to_spaces\n  - start_lists_with_dashes\n", encoding="utf-8")
+    edge_patterns = tmp_path / "patterns.yaml"
+    edge_patterns.write_text(
+        yaml.safe_dump(
+            {
+                "b_to_c": {"name": "b_to_c", "find": "b", "replace": "c", "is_regex": False},
+                "ac_to_d": {"name": "ac_to_d", "find": "ac", "replace": "d", "is_regex": False},
+            }
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "edge_lists.yaml").write_text("plain:\n  - b_to_c\n  - ac_to_d\n", encoding="utf-8")
+    tabs_plan = FindReplace(
+        Config(patterns_file="config/fr_patterns.yaml", pattern_list_file=str(edge_lists), pattern_list_name="tabs_then_dashes")
+    ).build_plan()
+    plain_plan = FindReplace(
+        Config(
+            patterns_file=str(edge_patterns),
+            pattern_list_file=str(tmp_path / "edge_lists.yaml"),
+            pattern_list_name="plain",
+        )
+    ).build_plan()
+    assert tabs_plan[1].producers == [0]
+    assert plain_plan[1].producers == [0]
+
+    class RecordingApplier(PatternApplier):
+        applied = []
+
+        def apply(self, text, pattern, start_line):
+            RecordingApplier.applied.append(pattern.name)
+            return super().apply(text, pattern, start_line)
+
+    target = tmp_path / "sample.md"
+    target.write_text("- **Item:** and *note*\n", encoding="utf-8")
+    config.path = str(target)
+    engine = FindReplace(config, file_processor=FileProcessor(config, applier=RecordingApplier()))
+    engine.process_files()
+
+    assert target.read_text(encoding="utf-8") == "- **Item:** and note\n"
+    assert "restore_protected_italicized" not in RecordingApplier.applied
+    assert "restore_leading_asterisk" not in RecordingApplier.applied
+
+
+def test_section_cache_reuses_rewrites_for_duplicate_sections(tmp_path):
+    footer = "```\ncode   \n```\n\nShared   footer   text\n"
+    (tmp_path / "a.md").write_text("# A\n\n" + footer, encoding="utf-8")
+    (tmp_path / "b.md").write_text("# B\n\n" + footer, encoding="utf-8")
+
+    config = Config(
+        path=str(tmp_path),
+        pattern="*.md",
+        patterns_file="config/fr_patterns.yaml",
+        pattern_name="remove_double_spaces",
+        recursive=False,
+    )
+    engine = FindReplace(config)
+    engine.process_files()
+
+    cache = engine.file_processor.cache
+    assert cache.hits >= 2
+    assert engine.file_processor.summary.files_changed == 2
+    for name in ("a.md", "b.md"):
+        assert (tmp_path / name).read_text(encoding="utf-8").endswith("```\ncode   \n```\n\nShared footer text\n")
+
+
+def test_section_cache_evicts_least_recently_used_entries():
+    cache = SectionCache(max_bytes=3000)
+    sections = [Section(start_line=1, text=f"{index}" * 500, is_code_block=False, is_table=False) for index in range(3)]
+    keys = [cache.key(section, "set") for section in sections]
+
+    for key, section in zip(keys, sections):
+        cache.put(key, section.text, section.text.upper() + "!", [(0, section.text, section.text + "!")])
+
+    assert cache.current_bytes <= cache.max_bytes
+    assert cache.get(keys[0], sections[0].text) is None
+    assert cache.get(keys[2], sections[2].text) == (sections[2].text + "!", [(0, sections[2].text, sections[2].text + "!")])
+
+
+def test_shards_partition_files_deterministically(tmp_path):
+    for index in range(20):
+        (tmp_path / f"doc{index}.md").write_text("foo\n", encoding="utf-8")
+
+    selected = []
+    for shard in ("1/3", "2/3", "3/3"):
+        config = Config(path=str(tmp_path), pattern="*.md", find="foo", replace="bar", is_regex=False, shard=shard)
+        processor = FileProcessor(config)
+        files = processor._select_shard(processor.get_files(), *processor._parse_shard(shard))
+        assert files == processor._select_shard(processor.get_files(), *processor._parse_shard(shard))
+        selected.extend(files)
+        FindReplace(config).process_files()
+
+    assert sorted(selected) == sorted(tmp_path.glob("*.md"))
+    assert all(path.read_text(encoding="utf-8") == "bar\n" for path in tmp_path.glob("*.md"))
+    assert FileProcessor(Config())._parse_shard("4/3") is None
+
+
+def test_work_queue_workers_share_files_and_merge_summary(tmp_path, capsys, monkeypatch):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for index in range(5):
+        (docs / f"doc{index}.md").write_text("foo\n", encoding="utf-8")
+    queue_path = tmp_path / "queue.sqlite"
+
+    config = Config(
+        path=str(docs),
+        pattern="*.md",
+        find="foo",
+        replace="bar",
+        is_regex=False,
+        work_queue=str(queue_path),
+        queue_batch_size=2,
+    )
+    first = FindReplace(config)
+    first.process_files()
+    monkeypatch.chdir(tmp_path)
+    config.path = "docs"
+    second = FindReplace(config)
+    second.process_files()
+
+    assert first.file_processor.summary.files_processed == 5
+    assert second.file_processor.summary.files_processed == 0
+    assert "5 files by 1 worker(s), 5 changed (5 changes)" in capsys.readouterr().out
+
+
+def test_work_queue_ignores_results_for_leases_taken_over(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), lease_seconds=0)
+    queue.enqueue(["a.md"])
+    assert queue.claim("slow", 1) == ["a.md"]
+    time.sleep(0.01)
+    assert queue.claim("fast", 1) == ["a.md"]
+
+    queue.complete("fast", [("a.md", FileResult(path="a.md", changed=True, changes=3))])
+    queue.complete("slow", [("a.md", None)])
+
+    summary = queue.summary()
+    queue.close()
+    assert (summary.files_processed, summary.files_changed, summary.changes) == (1, 1, 3)
+
+
+def test_resume_skips_files_completed_in_journal(tmp_path, capsys, monkeypatch):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("foo\n", encoding="utf-8")
+    (docs / "b.md").write_text("foo\n", encoding="utf-8")
+    journal = tmp_path / "run.jsonl"
+
+    config = Config(
+        path=str(docs),
+        pattern="*.md",
+        find="foo",
+        replace="bar",
+        is_regex=False,
+        journal=str(journal),
+        progress=True,
+    )
+    FindReplace(config).process_files()
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 2
+    assert "files/s" in capsys.readouterr().err
+
+    (docs / "b.md").write_text("foo again\n", encoding="utf-8")
+    config.resume = True
+    engine = FindReplace(config)
+    engine.process_files()
+
+    summary = engine.file_processor.summary
+    assert summary.files_processed == 2
+    assert summary.files_skipped == 1
+    assert (docs / "b.md").read_text(encoding="utf-8") == "bar again\n"
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 3
+
+    monkeypatch.chdir(tmp_path)
+    config.path = "./docs/"
+    engine = FindReplace(config)
+    engine.process_files()
+    assert engine.file_processor.summary.files_skipped == 2
+
+
+def test_dry_run_changeset_applies_without_rerunning_patterns(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    original = "---\ntitle: foo\n---\n\nfoo   text\n\n```\nfoo   \n```\n\nmore foo   "
+    (docs / "a.md").write_text(original, encoding="utf-8")
+    (docs / "b.md").write_text("foo   \n", encoding="utf-8")
+    (docs / "c.md").write_text("nothing here\n", encoding="utf-8")
+    changeset = tmp_path / "changes.jsonl"
+
+    config = Config(
+        path=str(docs),
+        pattern="*.md",
+        patterns_file="config/fr_patterns.yaml",
+        pattern_name="remove_trailing_spaces",
+        dry_run=True,
+        ensure_new_line=True,
+        changeset=str(changeset),
+    )
+    FindReplace(config).process_files()
+    assert (docs / "a.md").read_text(encoding="utf-8") == original
+
+    config.dry_run = False
+    config.changeset = None
+    expected_dir = tmp_path / "expected"
+    expected_dir.mkdir()
+    (expected_dir / "a.md").write_text(original, encoding="utf-8")
+    config.path = str(expected_dir)
+    FindReplace(config).process_files()
+
+    (docs / "b.md").write_text("edited after review\n", encoding="utf-8")
+    summary = ChangeSetApplier().apply(str(changeset))
+
+    assert (docs / "a.md").read_text(encoding="utf-8") == (expected_dir / "a.md").read_text(encoding="utf-8")
+    assert (docs / "b.md").read_text(encoding="utf-8") == "edited after review\n"
+    assert summary.files_changed == 1
+
+
+def test_apply_reports_unreadable_changesets(tmp_path, capsys):
+    assert ChangeSetApplier().apply(str(tmp_path / "missing.jsonl")).files_changed == 0
+    assert "Error: cannot read change set" in capsys.readouterr().out
+
+    broken_header = tmp_path / "header.jsonl"
+    broken_header.write_text("{not json\n", encoding="utf-8")
+    ChangeSetApplier().apply(str(broken_header))
+    assert "is not a version 1 change set" in capsys.readouterr().out
+
+    target = tmp_path / "a.md"
+    target.write_text("foo\n", encoding="utf-8")
+    changeset = tmp_path / "changes.jsonl"
+    FindReplace(
+        Config(path=str(target), find="foo", replace="bar", is_regex=False, dry_run=True, changeset=str(changeset))
+    ).process_files()
+    with open(changeset, "a", encoding="utf-8") as handle:
+        handle.write('{"path": \n')
+    capsys.readouterr()
+
+    summary = ChangeSetApplier().apply(str(changeset))
+
+    assert "malformed change set entry on line 3" in capsys.readouterr().out
+    assert summary.files_changed == 1
+    assert target.read_text(encoding="utf-8") == "bar\n"
+
+
+def test_resumed_dry_run_keeps_completed_files_in_changeset(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("foo\n", encoding="utf-8")
+    (docs / "b.md").write_text("foo\n", encoding="utf-8")
+    changeset = tmp_path / "changes.jsonl"
+
+    config = Config(
+        path=str(docs),
+        pattern="*.md",
+        find="foo",
+        replace="bar",
+        is_regex=False,
+        dry_run=True,
+        journal=str(tmp_path / "run.jsonl"),
+        changeset=str(changeset),
+    )
+    FindReplace(config).process_files()
+
+    config.resume = True
+    engine = FindReplace(config)
+    engine.process_files()
+    assert engine.file_processor.summary.files_skipped == 2
+
+    summary = ChangeSetApplier().apply(str(changeset))
+
+    assert summary.files_changed == 2
+    assert (docs / "a.md").read_text(encoding="utf-8") == "bar\n"
+    assert (docs / "b.md").read_text(encoding="utf-8") == "bar\n"
+
+
+def test_patterns_crossing_any_line_break_keep_the_full_split(tmp_path):
+    target = tmp_path / "sample.md"
+    content = "| a | b |\rnote\n"
+    target.write_bytes(content.encode("utf-8"))
+
+    engine = FindReplace(Config(path=str(target), find=r"\|.note", replace="|NOTE"))
+    assert engine.patterns[0].line_local is False
+    engine.process_files()
+
+    assert target.read_bytes().decode("utf-8") == content
+    for find in (r"z.body", r"[^\n]", r"\s", r"\W", r"^foo", r"foo$"):
+        assert FindReplace(Config(find=find, replace="x")).patterns[0].line_local is False
+    for find in (r"[ \t]+", r"\S+", r"\w+"):
+        assert FindReplace(Config(find=find, replace="x")).patterns[0].line_local is True
+
+
+def test_command_line_run_skips_section_classification(tmp_path):
+    target = tmp_path / "sample.md"
+    target.write_text("---\ntitle: foo\n---\nfoo\n```\nfoo\n```\n| foo | bar |\n", encoding="utf-8")
+
+    class RecordingSplitter(SectionSplitter):
+        requests = []
+
+        def split(self, content, frontmatter_in_body, **classifications):
+            RecordingSplitter.requests.append(classifications)
+            return super().split(content, frontmatter_in_body, **classifications)
+
+    config = Config(path=str(target), find="foo", replace="baz", is_regex=False)
+    engine = FindReplace(config, file_processor=FileProcessor(config, splitter=RecordingSplitter()))
+    assert engine.patterns[0].line_local is True
+    engine.process_files()
+
+    assert RecordingSplitter.requests == [{"detect_code_blocks": False, "detect_tables": False}]
+    assert engine.file_processor.cache.misses == 0
+    assert len(engine.file_processor.cache) == 0
+    assert target.read_text(encoding="utf-8") == "---\ntitle: baz\n---\nbaz\n```\nbaz\n```\n| baz | bar |\n"
+
+    multiline = FindReplace(Config(find=r"\*([^*]+?)\*", replace="$1")).patterns[0]
+    assert multiline.line_local is False
@@ -0,0 +1,171 @@
+import contextlib
+import os
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.markdown_find_replace.core import Config, FindReplace
+
+
+INPUT_BYTES = 128 * 1024
+
+# Budgets recorded against the generated corpus below, with headroom for slower
+# hosts and other Python versions. Peak, allocated and retained memory are
+# multiples of the input size, retained blocks are per input line, and time is
+# seconds per MB. Allocated memory sums every rise in traced memory between
+# calls and returns inside the stage, so temporary allocations count even when
+# they are freed before the peak; retained blocks are the ones still alive
+# after the stage returns.
+WORKLOADS = {
+    "normalize_markdown": {
+        "config": {
+            "patterns_file": "config/fr_patterns.yaml",
+            "pattern_list_file": "config/fr_list.yaml",
+            "pattern_list_name": "normalize_markdown",
+        },
+        "budgets": {
+            "read": {"peak_ratio": 6.0, "allocated_ratio": 5.0, "retained_ratio": 3.0, "retained_blocks_per_line": 0.05, "seconds_per_mb": 0.5},
+            "split": {"peak_ratio": 13.0, "allocated_ratio": 45.0, "retained_ratio": 6.0, "retained_blocks_per_line": 1.2, "seconds_per_mb": 1.0},
+            "apply": {"peak_ratio": 22.0, "allocated_ratio": 1200.0, "retained_ratio": 22.0, "retained_blocks_per_line": 6.0, "seconds_per_mb": 12.0},
+            "process_file": {"peak_ratio": 45.0, "allocated_ratio": 1300.0, "retained_ratio": 4.0, "retained_blocks_per_line": 1.0, "seconds_per_mb": 15.0},
+        },
+    },
+    "command_line": {
+        "config": {"find": "item", "replace": "entry", "is_regex": False},
+        "budgets": {
+            "read": {"peak_ratio": 6.0, "allocated_ratio": 5.0, "retained_ratio": 3.0, "retained_blocks_per_line": 0.05, "seconds_per_mb": 0.5},
+            "split": {"peak_ratio": 6.0, "allocated_ratio": 6.0, "retained_ratio": 3.0, "retained_blocks_per_line": 0.05, "seconds_per_mb": 0.5},
+            "apply": {"peak_ratio": 10.0, "allocated_ratio": 12.0, "retained_ratio": 5.0, "retained_blocks_per_line": 1.0, "seconds_per_mb": 1.0},
+            "process_file": {"peak_ratio": 16.0, "allocated_ratio": 37.0, "retained_ratio": 1.0, "retained_blocks_per_line": 0.2, "seconds_per_mb": 2.0},
+        },
+    },
+}
+
+BLOCK_TEMPLATES = [
+    "# **Heading {index}**\nIntro paragraph with “smart” quotes and trailing spaces   \n",
+    "*   item {index}\n*   **Bold item:** value\n    *  nested   item\n\n",
+    "```python\ndef function_{index}():\n    return {index}   \n```\n\n",
+    "| col {index} | value |\n| --- | --- |\n| a | b |\n\n",
+    "> quoted   line {index}\nNext paragraph line…\n\n",
+    "Plain\ttext   with  double spaces and *italic* words {index}.\n\n",
+]
+
+
+def generate_markdown(target_bytes):
+    generator = random.Random(0)
+    parts = ["---\ntitle: Sample\ntags: [a, b]\n---\n\n"]
+    size = 0
+    index = 0
+    while size < target_bytes:
+        block = generator.choice(BLOCK_TEMPLATES).format(index=index)
+        parts.append(block)
+        size += len(block.encode("utf-8"))
+        index += 1
+    return "".join(parts)
+
+
+def run_quietly(function):
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        return function()
+
+
+def measure_stage(name, function, input_bytes, input_lines):
+    started = time.perf_counter()
+    run_quietly(function)
+    elapsed = time.perf_counter() - started
+
+    allocated = 0
+    previous = 0
+
+    def sample(frame, event, argument):
+        nonlocal allocated, previous
+        current = tracemalloc.get_traced_memory()[0]
+        if current > previous:
+            allocated += current - previous
+        previous = current
+
+    tracemalloc.start()
+    try:
+        previous = tracemalloc.get_traced_memory()[0]
+        sys.setprofile(sample)
+        try:
+            result = run_quietly(function)
+        finally:
+            sys.setprofile(None)
+        retained, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    retained_blocks = sum(statistic.count for statistic in snapshot.statistics("filename"))
+    return {
+        "stage": name,
+        "peak_ratio": peak / input_bytes,
+        "allocated_ratio": allocated / input_bytes,
+        "retained_ratio": retained / input_bytes,
+        "retained_blocks_per_line": retained_blocks / input_lines,
+        "seconds_per_mb": elapsed / (input_bytes / (1024 * 1024)),
+    }
+
+
+def format_breakdown(measurements, breaches):
+    lines = [f"{'stage':<14}{'peak x':>10}{'allocated x':>13}{'retained x':>12}{'retained blk/line':>19}{'s/MB':>9}"]
+    for measurement in measurements:
+        lines.append(
+            f"{measurement['stage']:<14}"
+            f"{measurement['peak_ratio']:>10.2f}"
+            f"{measurement['allocated_ratio']:>13.2f}"
+            f"{measurement['retained_ratio']:>12.2f}"
+            f"{measurement['retained_blocks_per_line']:>19.2f}"
+            f"{measurement['seconds_per_mb']:>9.2f}"
+        )
+    lines.append("budget breaches:")
+    lines.extend(f"  {breach}" for breach in breaches)
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("workload", sorted(WORKLOADS))
+def test_stage_memory_and_throughput_budgets(tmp_path, workload):
+    config_values = WORKLOADS[workload]["config"]
+    budgets = WORKLOADS[workload]["budgets"]
+
+    content = generate_markdown(INPUT_BYTES)
+    target = tmp_path / "large.md"
+    target.write_text(content, encoding="utf-8")
+    input_bytes = os.path.getsize(target)
+    input_lines = content.count("\n")
+
+    isolated = FindReplace(Config(path=str(target), dry_run=True, section_cache_mb=0, **config_values))
+    processor = isolated.file_processor
+    patterns = isolated.patterns
+    sections = processor.split_sections(content, False, patterns)
+
+    engine = FindReplace(Config(path=str(target), dry_run=True, section_cache_mb=0, **config_values))
+
+    def process_file():
+        return engine.file_processor._process_file(target, engine.patterns)
+
+    stages = [
+        ("read", lambda: processor.read_file(target)),
+        ("split", lambda: processor.split_sections(content, False, patterns)),
+        ("apply", lambda: processor.apply_patterns(sections, patterns)),
+        ("process_file", process_file),
+    ]
+    measurements = [measure_stage(name, function, input_bytes, input_lines) for name, function in stages]
+
+    breaches = []
+    for measurement in measurements:
+        for metric, limit in budgets[measurement["stage"]].items():
+            if measurement[metric] > limit:
+                breaches.append(f"{measurement['stage']}.{metric} = {measurement[metric]:.2f} > {limit:.2f}")
+
+    assert not breaches, format_breakdown(measurements, breaches)